@@ -21,10 +21,18 @@ For a list of design parameters available, take a look at the
     # run the design task
     design.run()
 """
+import math
+import os
 import re
+import threading
 import webbrowser
+from concurrent.futures import Executor
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Tuple
 from typing import Union
@@ -32,8 +40,15 @@ from warnings import warn
 
 import primer3
 
+from . import aio
+from .batch import iter_run
+from .batch import run_first
+from .batch import run_many
+from .cache import result_key
+from .cache import ResultCache
 from .interfaces import AllParameters
 from .interfaces import ParameterAccessor
+from .results import parse_explain
 from .results import parse_primer3_results
 from primer3plus.constants import DOCURL
 from primer3plus.exceptions import Primer3PlusException
@@ -45,6 +60,19 @@ from primer3plus.params import default_boulderio
 from primer3plus.utils import anneal as anneal_primer
 from primer3plus.utils import depreciated_warning
 
+# primer3 keeps design settings in C globals, so design calls are serialized
+_primer3_lock = threading.Lock()
+
+
+def _reset_primer3_lock():
+    """Replace the lock in a forked child, which may have inherited it held."""
+    global _primer3_lock
+    _primer3_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_primer3_lock)
+
 
 class DesignPresets:
     """Interface for setting design parameters. This is typically accessed from
@@ -629,6 +657,30 @@ class DesignBase:
         PRIMER_MIN_TM=(-1, 48, DEFAULT_PARAMS["PRIMER_MIN_TM"]),
         PRIMER_MAX_HAIRPIN_TH=(1, DEFAULT_PARAMS["PRIMER_MAX_HAIRPIN_TH"], 60),
     )  #: the default gradient to use for the :meth:`Design.run_and_optimize` method.
+    EXPLAIN_GRADIENT = {
+        "low tm": ("PRIMER_MIN_TM", "PRIMER_MAX_SIZE"),
+        "high tm": ("PRIMER_MAX_TM", "PRIMER_MIN_SIZE"),
+        "high hairpin stability": ("PRIMER_MAX_HAIRPIN_TH",),
+        "high any compl": ("PRIMER_MAX_SELF_ANY_TH", "PRIMER_PAIR_MAX_COMPL_ANY_TH"),
+        "high end compl": ("PRIMER_MAX_SELF_END_TH", "PRIMER_PAIR_MAX_COMPL_END_TH"),
+        "GC content failed": ("PRIMER_MIN_GC", "PRIMER_MAX_GC"),
+        "GC clamp failed": ("PRIMER_GC_CLAMP",),
+        "long poly-x seq": ("PRIMER_MAX_POLY_X",),
+        "high template mispriming score": ("PRIMER_MAX_TEMPLATE_MISPRIMING_TH",),
+        "tm diff too large": ("PRIMER_PAIR_MAX_DIFF_TM",),
+    }  #: gradient parameters relaxed for each primer3 rejection reason
+    _EXPLAIN_KEYS = (
+        "PRIMER_LEFT_EXPLAIN",
+        "PRIMER_RIGHT_EXPLAIN",
+        "PRIMER_PAIR_EXPLAIN",
+    )
+    NUM_ITERATIONS = "PRIMER3PLUS_NUM_ITERATIONS"  #: explain key of relaxation runs
+    CHANGED_PARAMETERS = (
+        "PRIMER3PLUS_CHANGED_PARAMETERS"  #: explain key of the relaxed parameter values
+    )
+    _LINEAR = "linear"
+    _EXPLAIN = "explain"
+    _BISECT = "bisect"
     _CHECK_PRIMERS = "check_primers"
     _GENERIC = "generic"
     _PICK_PRIMER_LIST = "pick_primer_list"
@@ -643,11 +695,15 @@ class DesignBase:
         ] = None,
         params: BoulderIO = None,
         quiet_runtime: bool = False,
+        cache: ResultCache = None,
     ):
         """Initializes a new design.
 
         :param gradient: the design gradient.
         :param quiet_runtime: if True will siliently ignore any runtime errors.
+        :param cache: optional :class:`ResultCache
+            <primer3plus.design.cache.ResultCache>` used to skip primer3 calls for
+            previously designed arguments.
         """
         if params is None:
             params = self.DEFAULT_PARAMS.copy()
@@ -655,6 +711,7 @@ class DesignBase:
         self.logger = logger(self)
         self.gradient = gradient
         self.quiet_runtime = quiet_runtime
+        self.cache = cache
 
     def _raise_run_time_error(self, msg: str) -> Primer3PlusRunTimeError:
         """Raise a Primer3PlusRunTime exception. If parameters are named in the
@@ -678,8 +735,17 @@ class DesignBase:
         """
         if params is None:
             params = self.params
+        sequence_args = params._sequence()
+        global_args = params._globals()
+        key = None
+        if self.cache is not None:
+            key = result_key(sequence_args, global_args, params._extra())
+            results = self.cache.get(key)
+            if results is not None:
+                return results
         try:
-            res = primer3.bindings.designPrimers(params._sequence(), params._globals())
+            with _primer3_lock:
+                res = primer3.bindings.designPrimers(sequence_args, global_args)
         except OSError as e:
             if not self.quiet_runtime:
                 raise self._raise_run_time_error(str(e)) from e
@@ -695,6 +761,8 @@ class DesignBase:
 
         pairs, explain = parse_primer3_results(res)
         self.settings._post_parse(pairs, explain)
+        if key is not None:
+            self.cache.set(key, (pairs, explain))
         return pairs, explain
 
     def run(self) -> Tuple[List[Dict], List[Dict]]:
@@ -713,6 +781,8 @@ class DesignBase:
             str, Tuple[Union[float, int], Union[float, int], Union[float, int]]
         ] = None,
         run_kwargs: dict = None,
+        strategy: str = _LINEAR,
+        workers: int = None,
     ) -> Tuple[List[dict], List[dict]]:
         """Design primers and relax constraints. If primer design is
         unsuccessful, relax parameters as defined in
@@ -724,28 +794,161 @@ class DesignBase:
         :param gradient: optional gradient to provide. If not provided,
                             Design.DEFAULT_GRADIENT will be used. The gradient is a
                             dictionary off 3 tuples, the step the min and the max.
-        :return: results
+        :param strategy: the relaxation strategy. 'linear' steps every parameter
+            in the gradient on each iteration. 'explain' only steps the parameters
+            of the gradient that are blocking the design, according to the
+            rejection reasons primer3 reports (see
+            :attr:`DesignBase.EXPLAIN_GRADIENT`). 'bisect' searches for the
+            least number of steps (applied to every parameter) that yields pairs,
+            using about log2(steps) runs.
+        :return: results. The number of relaxation runs and the relaxed parameter
+            values are added to the explain dictionary under
+            :attr:`DesignBase.NUM_ITERATIONS` and
+            :attr:`DesignBase.CHANGED_PARAMETERS`.
+        :param workers: if more than 1, relaxation levels of the 'linear' strategy
+            are run speculatively in this many worker processes. The pairs and
+            parameters are the same as those of a sequential run, but up to
+            ``workers - 1`` levels beyond the returned one may also have been run.
         """
         if gradient is None:
             gradient = self.gradient or self.DEFAULT_GRADIENT
         if params is None:
             params = self.params
+        strategies = [self._LINEAR, self._EXPLAIN, self._BISECT]
+        if strategy not in strategies:
+            raise ValueError(
+                "Strategy '{}' not recognized. Select from {}".format(
+                    strategy, strategies
+                )
+            )
+        if workers is not None and workers > 1 and strategy != self._LINEAR:
+            raise ValueError(
+                "Only the '{}' strategy can be run with multiple workers".format(
+                    self._LINEAR
+                )
+            )
+        start = {k: params[k] for k in gradient}
         pairs, explain = self._run(params)
+        if strategy == self._BISECT:
+            pairs, explain, i = self._bisect(
+                max_iterations, params, gradient, pairs, explain
+            )
+        elif workers is not None and workers > 1:
+            pairs, explain, i = self._speculate(
+                max_iterations, params, gradient, pairs, explain, workers
+            )
+        else:
+            level, _ = self._levels(params, gradient)
+            i = 0
+            while i < max_iterations and len(pairs) == 0:
+                i += 1
+                if strategy == self._LINEAR:
+                    update = {k: v for k, v in level(i).items() if params[k] != v}
+                else:
+                    update = self._explain_update_dict(params, gradient, explain)
+                if update:
+                    self.logger.info("Updated: {}".format(update))
+                else:
+                    self.logger.info("Reached end of gradient.")
+                    break
+                params.update(update)
+                pairs, explain = self._run(params)
+        explain[self.NUM_ITERATIONS] = i
+        explain[self.CHANGED_PARAMETERS] = {
+            k: params[k] for k in gradient if params[k] != start[k]
+        }
+        return pairs, explain
+
+    @staticmethod
+    def _num_steps(value, delta, mn, mx) -> int:
+        """Number of gradient steps from the value to the gradient bound."""
+        if not delta:
+            return 0
+        if delta > 0:
+            bound = mx
+        else:
+            bound = mn
+        return max(0, int(math.ceil((bound - value) / delta)))
+
+    def _levels(self, params, gradient) -> Tuple[Callable[[int], dict], int]:
+        """Return a function of the parameter update at relaxation level k, in
+        which every parameter of the gradient is stepped k times (and clipped),
+        and the number of levels until the end of the gradient."""
+        start = {k: params[k] for k in gradient}
+
+        def level(k):
+            return {
+                key: type(start[key])(clip(start[key] + k * delta, mn, mx))
+                for key, (delta, mn, mx) in gradient.items()
+            }
+
+        n_levels = max(
+            [self._num_steps(start[k], *gradient[k]) for k in gradient] + [0]
+        )
+        return level, n_levels
+
+    def _bisect(
+        self, max_iterations, params, gradient, pairs, explain
+    ) -> Tuple[dict, dict, int]:
+        """Bisect over relaxation levels. At level k, every parameter of the
+        gradient is stepped k times (and clipped). The fully relaxed level is
+        tried first. If it yields pairs, bisect for the least relaxed level that
+        still does. Parameters are left at the level of the returned results.
+        """
+        if pairs:
+            return pairs, explain, 0
+        level, n_levels = self._levels(params, gradient)
+        if not n_levels:
+            self.logger.info("Reached end of gradient.")
+            return pairs, explain, 0
+        lo, hi = 0, n_levels  # level 'lo' fails, level 'hi' is yet to be tried
+        best = None
         i = 0
-        while i < max_iterations and len(pairs) == 0:
+        while i < max_iterations and hi - lo > (0 if best is None else 1):
             i += 1
-            update = self._update_dict(params, gradient=gradient)
-            if update:
-                self.logger.info("Updated: {}".format(update))
+            if best is None:
+                mid = hi
             else:
-                self.logger.info("Reached end of gradient.")
-                break
-            self.params.update(update)
+                mid = (lo + hi) // 2
+            update = level(mid)
+            self.logger.info("Updated: {}".format(update))
+            params.update(update)
             pairs, explain = self._run(params)
-        return pairs, explain
+            if pairs:
+                best = (mid, pairs, explain)
+                hi = mid
+            elif best is None:
+                self.logger.info("No pairs at the end of the gradient.")
+                return pairs, explain, i
+            else:
+                lo = mid
+        if best is None:
+            return pairs, explain, i
+        mid, pairs, explain = best
+        params.update(level(mid))
+        return pairs, explain, i
+
+    def _speculate(
+        self, max_iterations, params, gradient, pairs, explain, workers
+    ) -> Tuple[dict, dict, int]:
+        """Run relaxation levels 1, 2, ... concurrently in worker processes and
+        keep the least relaxed level that yields pairs. The levels are the same
+        as those of the sequential 'linear' strategy, so the number of iterations
+        reported is the number of the returned level, not the number of runs."""
+        if pairs:
+            return pairs, explain, 0
+        level, n_levels = self._levels(params, gradient)
+        updates = [level(k) for k in range(1, min(n_levels, max_iterations) + 1)]
+        if not updates:
+            self.logger.info("Reached end of gradient.")
+            return pairs, explain, 0
+        i, pairs, explain = run_first(self, updates, workers=workers, params=params)
+        self.logger.info("Updated: {}".format(updates[i]))
+        params.update(updates[i])
+        return pairs, explain, i + 1
 
     @staticmethod
-    def _update_dict(params, gradient):
+    def _update_dict(params, gradient, explain=None):
         update = {}
         for param_key, gradient_tuple in gradient.items():
             delta, mn, mx = gradient_tuple
@@ -758,6 +961,37 @@ class DesignBase:
                 raise e
         return update
 
+    @classmethod
+    def _blocking_reasons(cls, explain: dict) -> Dict[str, int]:
+        """Return the rejection reasons of every left, right or pair explain
+        that considered candidates but found none acceptable."""
+        reasons = {}
+        for key in cls._EXPLAIN_KEYS:
+            if key not in explain:
+                continue
+            counts = parse_explain(explain[key])
+            if not counts.get("considered") or counts.get("ok"):
+                continue
+            for reason, n in counts.items():
+                if n and reason not in ["considered", "ok"]:
+                    reasons[reason] = reasons.get(reason, 0) + n
+        return reasons
+
+    @classmethod
+    def _explain_update_dict(cls, params, gradient, explain):
+        """Step only the gradient parameters that address the blocking
+        rejection reasons. If none of them can be stepped, step the entire
+        gradient."""
+        keys = set()
+        for reason in cls._blocking_reasons(explain):
+            keys.update(cls.EXPLAIN_GRADIENT.get(reason, tuple()))
+        update = cls._update_dict(
+            params, {k: v for k, v in gradient.items() if k in keys}
+        )
+        if not update:
+            update = cls._update_dict(params, gradient)
+        return update
+
     @staticmethod
     def open_help():
         """Open the documentation help in a new browser tab."""
@@ -788,7 +1022,7 @@ class RestoreAfterRun:
 
 
 class Design(DesignBase, AllParameters):
-    def __init__(self):
+    def __init__(self, params: BoulderIO = None, cache: ResultCache = None):
         """Initialize a new design. Set parameters using.
 
         :attr:`Design.settings`, which
@@ -806,8 +1040,14 @@ class Design(DesignBase, AllParameters):
             design.settings.left_sequence("GTAGTGCTTGTA")
             design.SEQUENCE_ID.value = "MY ID"
             design.run()
+
+        :param params: optional parameters to use. If not provided, a copy of the
+            default parameters is used.
+        :param cache: optional :class:`ResultCache
+            <primer3plus.design.cache.ResultCache>`. Runs with the same effective
+            primer3 arguments as a previous run return the cached results.
         """
-        super().__init__()
+        super().__init__(params=params, cache=cache)
         self._settings = DesignPresets(self)
 
     def set(self, key, value):
@@ -841,6 +1081,124 @@ class Design(DesignBase, AllParameters):
             self.settings._resolve()
             return super()._run(None)
 
+    def run_many(
+        self,
+        jobs: List[Union[str, Dict[str, Any]]],
+        workers: int = None,
+        chunksize: int = None,
+    ) -> List[Tuple[Dict, Dict]]:
+        """Design primers for many jobs using a pool of worker processes. Each
+        job is either a template sequence or a dictionary of parameters and is
+        applied on top of this design's parameters, which are left unchanged.
+
+        Errors are returned as values rather than aborting the batch. A failed
+        job returns ``({}, {"PRIMER_ERROR": msg})``.
+
+        .. code-block::
+
+            design = Design()
+            design.settings.as_cloning_task()
+            results = design.run_many([template1, template2], workers=4)
+            for pairs, explain in results:
+                ...
+
+        :param jobs: list of template sequences or parameter dictionaries
+        :param workers: number of worker processes (default: number of cpus).
+            If 1, jobs are run serially in this process.
+        :param chunksize: number of jobs sent to a worker at a time
+        :return: list of (pairs, explain) results in the same order as the jobs
+        """
+        return run_many(self, jobs, workers=workers, chunksize=chunksize)
+
+    def run_iter(
+        self,
+        jobs: Iterable[Union[str, Dict[str, Any]]],
+        workers: int = None,
+        max_in_flight: int = None,
+    ) -> Iterator[Tuple[Union[str, Dict[str, Any]], Dict, Dict]]:
+        """Lazily design primers for a stream of jobs using a pool of worker
+        processes, yielding results as they finish. Jobs are read from the
+        iterable only as needed so that at most ``max_in_flight`` jobs are
+        pending at any time, keeping memory constant for arbitrarily long
+        inputs. Errors are returned as values, as in :meth:`run_many
+        <primer3plus.design.Design.run_many>`.
+
+        .. code-block::
+
+            from primer3plus.io import read_fasta
+
+            design = Design()
+            for job, pairs, explain in design.run_iter(read_fasta("seqs.fasta")):
+                print(job["SEQUENCE_ID"], len(pairs))
+
+        :param jobs: iterable of template sequences or parameter dictionaries
+        :param workers: number of worker processes (default: number of cpus).
+            If 1, jobs are run serially in this process.
+        :param max_in_flight: max number of pending jobs (default: twice the
+            number of workers)
+        :return: iterator of (job, pairs, explain) in the order jobs finish
+        """
+        return iter_run(self, jobs, workers=workers, max_in_flight=max_in_flight)
+
+    def arun(
+        self, executor: Executor = None, timeout: float = None
+    ) -> Awaitable[Tuple[Dict, Dict]]:
+        """Design primers in an executor without blocking the event loop.
+
+        The design runs on a snapshot of the parameters taken when this method
+        is called. The snapshot is run in the shared
+        executor (a process pool by default, see
+        :func:`primer3plus.design.aio.set_executor`), so many designs may be
+        awaited at once and this design may be modified while the job runs.
+
+        .. code-block::
+
+            pairs, explain = await design.arun(timeout=60)
+
+        :param executor: optional executor to use instead of the shared executor
+        :param timeout: optional timeout in seconds. Raises
+            :class:`asyncio.TimeoutError` if the design does not finish in time.
+        :return: awaitable results
+        """
+        return aio.arun(self, executor=executor, timeout=timeout)
+
+    def arun_and_optimize(
+        self,
+        max_iterations,
+        gradient: Dict[
+            str, Tuple[Union[float, int], Union[float, int], Union[float, int]]
+        ] = None,
+        pick_anyway: bool = False,
+        strategy: str = DesignBase._LINEAR,
+        workers: int = None,
+        executor: Executor = None,
+        timeout: float = None,
+    ) -> Awaitable[Tuple[Dict, Dict]]:
+        """Asynchronous version of :meth:`run_and_optimize
+        <primer3plus.design.Design.run_and_optimize>`. See :meth:`arun
+        <primer3plus.design.Design.arun>`.
+
+        :param max_iterations: the max number of iterations to perform relaxation
+        :param gradient: optional gradient to provide
+        :param pick_anyway: if set to True, if the optimization finds no pairs,
+            pick a pair anyways.
+        :param strategy: the relaxation strategy
+        :param workers: number of worker processes for speculative relaxation
+        :param executor: optional executor to use instead of the shared executor
+        :param timeout: optional timeout in seconds
+        :return: awaitable results
+        """
+        return aio.arun_and_optimize(
+            self,
+            executor=executor,
+            timeout=timeout,
+            max_iterations=max_iterations,
+            gradient=gradient,
+            pick_anyway=pick_anyway,
+            strategy=strategy,
+            workers=workers,
+        )
+
     def run_and_optimize(
         self,
         max_iterations,
@@ -849,6 +1207,8 @@ class Design(DesignBase, AllParameters):
             str, Tuple[Union[float, int], Union[float, int], Union[float, int]]
         ] = None,
         pick_anyway: bool = False,
+        strategy: str = DesignBase._LINEAR,
+        workers: int = None,
     ) -> Tuple[List[dict], List[dict]]:
         """Design primers. If primer design is unsuccessful, relax parameters
         as defined in primer3plust.Design.DEFAULT_GRADIENT. Repeat for the
@@ -861,11 +1221,24 @@ class Design(DesignBase, AllParameters):
                             dictionary off 3 tuples, the step the min and the max.
         :param pick_anyway: if set to True, if the optimization finds no pairs,
             pick a pair anyways.
+        :param strategy: the relaxation strategy. 'linear' steps every parameter
+            in the gradient on each iteration. 'explain' only steps the parameters
+            that are blocking the design, according to primer3's explain output.
+            'bisect' bisects for the least relaxed parameters that yield pairs.
+        :param workers: if more than 1, relaxation levels of the 'linear' strategy
+            are run speculatively in this many worker processes and the least
+            relaxed level that yields pairs is returned.
         :return: results
         """
         with RestoreAfterRun(self.params):
             self.settings._resolve()
-            pairs, explain = super().run_and_optimize(max_iterations)
+            pairs, explain = super().run_and_optimize(
+                max_iterations,
+                params=params,
+                gradient=gradient,
+                strategy=strategy,
+                workers=workers,
+            )
             if pick_anyway and not pairs:
                 self.settings.pick_anyway(1)
                 pairs, explain = super().run()
@@ -0,0 +1,137 @@
+"""Asyncio front-end for primer design.
+
+The primer3 design bindings hold the GIL for the entire design and keep their
+state in C globals, so awaiting a design in the event loop's thread would block
+the loop. Instead, a snapshot of the design's parameters is sent to an executor
+(by default a process pool shared by all designs) and the result is awaited.
+
+.. code-block:: python
+
+    async def main(templates):
+        designs = []
+        for template in templates:
+            design = Design()
+            design.settings.template(template)
+            designs.append(design)
+        return await asyncio.gather(*[d.arun(timeout=60) for d in designs])
+
+Because jobs run on a snapshot, the design can be modified (or awaited
+again) while a job is in flight. Cancelling the awaiting task cancels jobs that
+have not started yet. Jobs that have already started in a worker process run to
+completion, but their result is discarded.
+"""
+import asyncio
+import functools
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+from .batch import new_params
+
+_executor = None  #: executor shared by all designs
+
+
+def get_executor() -> Executor:
+    """Return the executor shared by all designs, creating a process pool
+    executor on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor()
+    return _executor
+
+
+def set_executor(executor: Executor = None):
+    """Set the executor shared by all designs. The previous executor is not
+    shut down.
+
+    :param executor: the executor. If None, a new process pool executor will
+        be created on next use.
+    :return: None
+    """
+    global _executor
+    _executor = executor
+
+
+def _snapshot(design) -> Dict[str, Any]:
+    return {
+        "design_cls": design.__class__,
+        "values": design.params.as_dict(),
+        "gradient": design.gradient,
+        "quiet_runtime": design.quiet_runtime,
+        "cache": design.cache,
+    }
+
+
+def _restore(snapshot: Dict[str, Any]):
+    design_cls = snapshot["design_cls"]
+    design = design_cls(
+        params=new_params(design_cls, snapshot["values"]), cache=snapshot["cache"]
+    )
+    design.gradient = snapshot["gradient"]
+    design.quiet_runtime = snapshot["quiet_runtime"]
+    return design
+
+
+def _run(snapshot: Dict[str, Any]) -> Tuple[dict, dict]:
+    return _restore(snapshot).run()
+
+
+def _run_and_optimize(snapshot: Dict[str, Any], kwargs: dict) -> Tuple[dict, dict]:
+    return _restore(snapshot).run_and_optimize(**kwargs)
+
+
+async def _submit(
+    fn: Callable, *args, executor: Executor = None, timeout: float = None
+):
+    if executor is None:
+        executor = get_executor()
+    try:
+        loop = asyncio.get_running_loop()
+    except AttributeError:  # python < 3.7
+        loop = asyncio.get_event_loop()
+    future = loop.run_in_executor(executor, functools.partial(fn, *args))
+    return await asyncio.wait_for(future, timeout)
+
+
+def arun(
+    design, executor: Executor = None, timeout: float = None
+) -> Awaitable[Tuple[dict, dict]]:
+    """Run the design in an executor. The design's parameters are captured
+    when this is called, not when the result is first awaited.
+
+    :param design: the design
+    :param executor: optional executor. If not provided, the shared executor
+        from :func:`get_executor` is used.
+    :param timeout: optional timeout in seconds. Raises
+        :class:`asyncio.TimeoutError` if the design does not finish in time.
+    :return: awaitable of the pairs and explain dictionaries
+    """
+    return _submit(_run, _snapshot(design), executor=executor, timeout=timeout)
+
+
+def arun_and_optimize(
+    design, executor: Executor = None, timeout: float = None, **kwargs
+) -> Awaitable[Tuple[dict, dict]]:
+    """Run and optimize the design in an executor. The design's parameters
+    are captured when this is called, not when the result is first awaited.
+
+    :param design: the design
+    :param executor: optional executor. If not provided, the shared executor
+        from :func:`get_executor` is used.
+    :param timeout: optional timeout in seconds. Raises
+        :class:`asyncio.TimeoutError` if the design does not finish in time.
+    :param kwargs: arguments passed to :meth:`Design.run_and_optimize
+        <primer3plus.design.Design.run_and_optimize>`
+    :return: awaitable of the pairs and explain dictionaries
+    """
+    return _submit(
+        _run_and_optimize,
+        _snapshot(design),
+        kwargs,
+        executor=executor,
+        timeout=timeout,
+    )
@@ -0,0 +1,237 @@
+"""Run many primer designs across a pool of worker processes.
+
+Each worker process receives the parameters of the originating design once
+(at pool start up) and then only the per-job updates. Every job runs on a
+fresh copy of those parameters, so the usual
+:meth:`Design.run <primer3plus.design.Design.run>` semantics (overhang and
+long primer resolution, result post-processing) apply to every job.
+
+.. code-block:: python
+
+    design = Design()
+    design.settings.as_cloning_task()
+    results = design.run_many([template1, template2], workers=4)
+
+The design's :class:`ResultCache <primer3plus.design.cache.ResultCache>`, if
+any, is used by every job. Worker processes share only its on-disk backend.
+
+For very large or unbounded inputs, :func:`iter_run` consumes jobs lazily and
+yields results as they finish, keeping at most ``max_in_flight`` jobs in memory.
+
+:func:`run_first` runs a sequence of parameter updates speculatively and
+returns the first (in order) that yields pairs. It is used for parallel
+relaxation in :meth:`Design.run_and_optimize
+<primer3plus.design.Design.run_and_optimize>`.
+"""
+import copy
+import multiprocessing
+import queue
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from .cache import ResultCache
+from primer3plus.params import BoulderIO
+
+Job = Union[str, Dict[str, Any]]
+
+_worker_state = {}  #: design class and parameters held by each worker process
+
+
+def _as_update(job: Job) -> Dict[str, Any]:
+    """Convert a job (a template sequence or a dictionary of parameters) into
+    a parameter update dictionary."""
+    if isinstance(job, str):
+        return {"SEQUENCE_TEMPLATE": job}
+    return dict(job)
+
+
+def run_job(
+    design_cls: type, params: BoulderIO, job: Job, cache: ResultCache = None
+) -> Tuple[dict, dict]:
+    """Run a single design job on a copy of the provided parameters.
+
+    Errors are returned as values in the same form used by
+    ``quiet_runtime`` designs, that is ``({}, {"PRIMER_ERROR": msg})``.
+
+    :param design_cls: the design class used to run the job
+    :param params: the base parameters. These are copied and never modified.
+    :param job: a template sequence or a dictionary of parameters
+    :param cache: optional result cache
+    :return: the pairs and explain dictionaries
+    """
+    try:
+        design = design_cls(params=params.copy(), cache=cache)
+        design.update(_as_update(job))
+        return design.run()
+    except Exception as e:
+        return {}, {"PRIMER_ERROR": str(e)}
+
+
+def new_params(design_cls: type, values: Dict[str, Any]) -> BoulderIO:
+    """Create new parameters for the design class from a dictionary of
+    values, as returned by :meth:`BoulderIO.as_dict
+    <primer3plus.params.BoulderIO.as_dict>`."""
+    params = design_cls.DEFAULT_PARAMS.copy()
+    params.update(values)
+    return params
+
+
+def _init_worker(design_cls: type, values: Dict[str, Any], quiet_runtime: bool = False):
+    _worker_state["design_cls"] = design_cls
+    _worker_state["params"] = new_params(design_cls, values)
+    _worker_state["quiet_runtime"] = quiet_runtime
+
+
+def _run_worker_job(job: Job) -> Tuple[dict, dict]:
+    return run_job(_worker_state["design_cls"], _worker_state["params"], job)
+
+
+def _run_worker_update(update: Dict[str, Any]) -> Tuple[dict, dict]:
+    """Run the worker's parameters, which have already been resolved, with an
+    update applied."""
+    design = _worker_state["design_cls"](
+        params=_worker_state["params"].copy(), cache=_worker_state["cache"]
+    )
+    design.quiet_runtime = _worker_state["quiet_runtime"]
+    design.params.update(update)
+    return design._run()
+
+
+def run_many(
+    design, jobs: Iterable[Job], workers: int = None, chunksize: int = None
+) -> List[Tuple[dict, dict]]:
+    """Run many design jobs derived from a design.
+
+    :param design: the design providing the base parameters
+    :param jobs: template sequences or dictionaries of parameters. Each job is
+        applied on top of the design's current parameters.
+    :param workers: number of worker processes. Defaults to the number of cpus.
+        If 1, jobs are run serially in this process.
+    :param chunksize: number of jobs sent to a worker at a time. By default, an
+        appropriate chunksize is chosen from the number of jobs.
+    :return: list of (pairs, explain) results in the same order as the jobs
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    design_cls = design.__class__
+    if workers <= 1:
+        return [
+            run_job(design_cls, design.params, job, cache=design.cache) for job in jobs
+        ]
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(design_cls, design.params.as_dict(), False, design.cache),
+    ) as pool:
+        return pool.map(_run_worker_job, jobs, chunksize)
+
+
+def iter_run(
+    design, jobs: Iterable[Job], workers: int = None, max_in_flight: int = None
+) -> Iterator[Tuple[Job, dict, dict]]:
+    """Lazily run design jobs, yielding results as they finish.
+
+    Jobs are pulled from the iterable only when fewer than ``max_in_flight``
+    jobs are pending, so memory use does not grow with the number of jobs.
+
+    :param design: the design providing the base parameters
+    :param jobs: iterable of template sequences or dictionaries of parameters
+    :param workers: number of worker processes. Defaults to the number of cpus.
+        If 1, jobs are run serially in this process.
+    :param max_in_flight: max number of submitted jobs whose results have not yet
+        been yielded. Defaults to twice the number of workers.
+    :return: iterator of (job, pairs, explain) in the order the jobs finish
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    design_cls = design.__class__
+    if workers <= 1:
+        for job in jobs:
+            pairs, explain = run_job(design_cls, design.params, job, cache=design.cache)
+            yield job, pairs, explain
+        return
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    done = queue.Queue()
+    jobs = iter(jobs)
+    exhausted = False
+    in_flight = 0
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(design_cls, design.params.as_dict(), False, design.cache),
+    ) as pool:
+        while True:
+            while not exhausted and in_flight < max_in_flight:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pool.apply_async(
+                    _run_worker_job,
+                    (job,),
+                    callback=lambda result, job=job: done.put((job, result)),
+                    error_callback=lambda e, job=job: done.put((job, e)),
+                )
+                in_flight += 1
+            if not in_flight:
+                return
+            job, result = done.get()
+            in_flight -= 1
+            if isinstance(result, BaseException):
+                raise result
+            pairs, explain = result
+            yield job, pairs, explain
+
+
+def run_first(
+    design,
+    updates: List[Dict[str, Any]],
+    workers: int = None,
+    params: BoulderIO = None,
+) -> Tuple[int, dict, dict]:
+    """Speculatively run the design's resolved parameters with each of the
+    updates applied, in order, across ``workers`` processes, and return the
+    first update (in order) that yields pairs. Runs of later updates are
+    terminated.
+
+    :param design: the design providing the resolved parameters
+    :param updates: the parameter updates, in order of preference
+    :param workers: number of worker processes. Defaults to the number of cpus.
+    :param params: resolved parameters to use instead of the design's parameters
+    :return: the index of the update and its pairs and explain dictionaries. If
+        no update yields pairs, the results of the last update are returned.
+    """
+    if not updates:
+        raise ValueError("At least one update must be provided")
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if params is None:
+        params = design.params
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(
+            design.__class__,
+            params.as_dict(),
+            design.quiet_runtime,
+            design.cache,
+        ),
+    ) as pool:
+        # the pool starts the runs in order, so at most 'workers' run at a time
+        results = [pool.apply_async(_run_worker_update, (u,)) for u in updates]
+        for i, result in enumerate(results):
+            pairs, explain = result.get()
+            if pairs:
+                break
+    # leaving the context terminates any runs still pending
+    return i, pairs, explain
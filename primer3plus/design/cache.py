@@ -0,0 +1,181 @@
+"""Content-addressed cache of design results.
+
+Results are keyed by a stable hash of the effective primer3 arguments, that is
+the cleaned sequence and global arguments sent to primer3 after overhangs and
+long primers have been resolved, together with the extra parameters that
+modify the results. A hit skips the primer3 call entirely.
+
+.. code-block:: python
+
+    cache = ResultCache(maxsize=10000, path="results.sqlite")
+    design = Design(cache=cache)
+    design.settings.template(template)
+    design.run()  # miss
+    design.run()  # hit
+    print(cache.info())
+"""
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+from collections import namedtuple
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def result_key(
+    sequence_args: Dict[str, Any],
+    global_args: Dict[str, Any],
+    extra_args: Dict[str, Any],
+) -> str:
+    """Return a stable hash for a set of design arguments.
+
+    :param sequence_args: cleaned primer3 sequence arguments
+    :param global_args: cleaned primer3 global arguments
+    :param extra_args: extra (primer3plus) arguments
+    :return: hex digest
+    """
+    data = json.dumps(
+        [sequence_args, global_args, extra_args], sort_keys=True, default=repr
+    )
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class SQLiteBackend:
+    """On-disk store of pickled results."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)"
+            )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def set(self, key: str, value: bytes):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        self._conn.close()
+
+
+class ResultCache:
+    """LRU cache of design results with an optional on-disk backend.
+
+    Results are stored pickled, so every hit returns an independent copy that
+    may be modified freely. Since unpickling can execute arbitrary code, only
+    use a database file that is writable by trusted users.
+
+    A cache sent to another process (for example by
+    :meth:`Design.run_many <primer3plus.design.Design.run_many>` or
+    :meth:`Design.arun <primer3plus.design.Design.arun>`) starts with an empty
+    memory cache, but shares the on-disk backend.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: str = None):
+        """Initialize a new cache.
+
+        :param maxsize: max number of results held in memory. The least recently
+            used results are evicted first.
+        :param path: optional path to a sqlite database in which all results
+            are also stored. Results in the database are shared between processes
+            and persist between runs. The database holds pickled results, so it
+            must not be writable by untrusted users.
+        """
+        self.maxsize = maxsize
+        self.hits = 0  #: number of cache hits
+        self.misses = 0  #: number of cache misses
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if path is None:
+            self.backend = None
+        else:
+            self.backend = SQLiteBackend(path)
+
+    def __reduce__(self):
+        if self.backend is None:
+            return self.__class__, (self.maxsize,)
+        return self.__class__, (self.maxsize, self.backend.path)
+
+    def get(self, key: str) -> Optional[Tuple[dict, dict]]:
+        """Return the results stored for the key, or None.
+
+        :param key: the result key
+        :return: copy of the (pairs, explain) results or None
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        if value is None and self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(value)
+
+    def set(self, key: str, results: Tuple[dict, dict]):
+        """Store results for the key.
+
+        :param key: the result key
+        :param results: the (pairs, explain) results
+        :return: None
+        """
+        value = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def _store(self, key: str, value: bytes):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Clear all results (including the backend) and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+        if self.backend is not None:
+            self.backend.clear()
+
+    def info(self) -> CacheInfo:
+        """Return the hits, misses, maxsize and current size of the cache."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,4 +1,5 @@
 import re
+from typing import Dict
 from typing import Tuple
 
 import primer3
@@ -146,6 +147,22 @@ def parse_primer3_results(results_dict: dict) -> Tuple[dict, dict]:
     return pairs, other
 
 
+def parse_explain(explain: str) -> Dict[str, int]:
+    """Parse a primer3 explain string, such as
+    'considered 10, low tm 9, ok 1', into a dictionary of counts keyed by
+    reason.
+
+    :param explain: the explain string
+    :return: dictionary of counts
+    """
+    counts = {}
+    for token in explain.split(","):
+        reason, _, count = token.strip().rpartition(" ")
+        if reason and count.isdigit():
+            counts[reason] = int(count)
+    return counts
+
+
 def to_pair_result(data):
     left_data = data["LEFT"]
     right_data = data["RIGHT"]
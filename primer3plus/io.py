@@ -0,0 +1,79 @@
+"""Lazy readers for design jobs.
+
+Readers yield one dictionary of design parameters per record and never load
+the whole file into memory. The dictionaries can be passed directly to
+:meth:`Design.run_iter <primer3plus.design.Design.run_iter>` or
+:meth:`Design.run_many <primer3plus.design.Design.run_many>`.
+
+.. code-block:: python
+
+    design = Design()
+    for job, pairs, explain in design.run_iter(read_fasta("templates.fasta")):
+        print(job["SEQUENCE_ID"], len(pairs))
+"""
+import gzip
+import json
+from contextlib import contextmanager
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import Union
+
+PathOrHandle = Union[str, IO]
+
+
+@contextmanager
+def _open_text(path_or_handle: PathOrHandle) -> Iterator[IO]:
+    """Open a path for reading text, or pass through an open handle.
+
+    Paths ending in '.gz' are decompressed.
+    """
+    if not isinstance(path_or_handle, str):
+        yield path_or_handle
+    elif path_or_handle.endswith(".gz"):
+        with gzip.open(path_or_handle, "rt") as f:
+            yield f
+    else:
+        with open(path_or_handle) as f:
+            yield f
+
+
+def read_fasta(path_or_handle: PathOrHandle) -> Iterator[Dict[str, str]]:
+    """Lazily read a FASTA file. Yields a dictionary with the
+    'SEQUENCE_ID' (the first word of the header) and 'SEQUENCE_TEMPLATE' for
+    each record.
+
+    :param path_or_handle: path to the file or an open text handle
+    :return: iterator of parameter dictionaries
+    """
+    with _open_text(path_or_handle) as f:
+        name = None
+        lines = []
+        for line in f:
+            line = line.strip()
+            if line.startswith(">"):
+                if name is not None:
+                    yield {"SEQUENCE_ID": name, "SEQUENCE_TEMPLATE": "".join(lines)}
+                header = line[1:].split()
+                name = header[0] if header else ""
+                lines = []
+            elif line:
+                lines.append(line)
+        if name is not None:
+            yield {"SEQUENCE_ID": name, "SEQUENCE_TEMPLATE": "".join(lines)}
+
+
+def read_jsonl(path_or_handle: PathOrHandle) -> Iterator[Dict[str, Any]]:
+    """Lazily read a JSON lines file in which each line is a dictionary of
+    design parameters, such as
+    ``{"SEQUENCE_ID": "seq1", "SEQUENCE_TEMPLATE": "AGGT..."}``.
+
+    :param path_or_handle: path to the file or an open text handle
+    :return: iterator of parameter dictionaries
+    """
+    with _open_text(path_or_handle) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
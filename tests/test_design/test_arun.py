@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import primer3
+import pytest
+
+from primer3plus import Design
+from primer3plus.utils import reverse_complement
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def new_design(template):
+    design = Design()
+    design.settings.template(template)
+    design.settings.primer_num_return(1)
+    return design
+
+
+def test_arun(gfp):
+    design = new_design(gfp)
+    assert run(design.arun()) == design.run()
+
+
+def test_arun_many_at_once(gfp):
+    designs = [new_design(gfp[i : i + 400]) for i in range(0, 300, 100)]
+
+    async def gather():
+        return await asyncio.gather(*[d.arun() for d in designs])
+
+    results = run(gather())
+    for design, result in zip(designs, results):
+        assert result[0]
+        assert result == design.run()
+
+
+def test_arun_uses_snapshot(gfp):
+    design = new_design(gfp)
+    expected = design.run()
+
+    async def run_and_modify():
+        task = asyncio.ensure_future(design.arun())
+        design.settings.template(gfp[:100])
+        return await task
+
+    assert run(run_and_modify()) == expected
+
+
+def test_arun_with_thread_executor(gfp):
+    designs = [new_design(gfp[i : i + 400]) for i in range(0, 300, 100)]
+    with ThreadPoolExecutor(4) as executor:
+
+        async def gather():
+            return await asyncio.gather(*[d.arun(executor=executor) for d in designs])
+
+        results = run(gather())
+    for design, result in zip(designs, results):
+        assert result == design.run()
+
+
+def test_arun_timeout(gfp):
+    design = new_design(gfp)
+    with pytest.raises(asyncio.TimeoutError):
+        run(design.arun(timeout=1e-9))
+
+
+def test_arun_and_optimize(gfp):
+    design = Design()
+    design.settings.template(gfp)
+    design.settings.left_sequence(gfp[:25])
+    design.settings.right_sequence(reverse_complement(gfp[-25:]))
+    design.settings.task("check_primers")
+    pairs, explain = run(design.arun_and_optimize(15))
+    assert pairs
+    assert (pairs, explain) == design.run_and_optimize(15)
+
+
+def test_arun_cancel(gfp, monkeypatch):
+    calls = []
+    design_primers = primer3.bindings.designPrimers
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return design_primers(*args, **kwargs)
+
+    monkeypatch.setattr(primer3.bindings, "designPrimers", counted)
+
+    design = new_design(gfp)
+    release = threading.Event()
+    with ThreadPoolExecutor(1) as executor:
+        # occupy the only thread so the design job cannot start
+        executor.submit(release.wait)
+
+        async def cancel():
+            task = asyncio.ensure_future(design.arun(executor=executor))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        run(cancel())
+        release.set()
+    assert not calls
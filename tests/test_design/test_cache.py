@@ -0,0 +1,102 @@
+import pickle
+
+import primer3
+import pytest
+
+from primer3plus import Design
+from primer3plus.design.cache import ResultCache
+
+
+@pytest.fixture
+def count_calls(monkeypatch):
+    calls = []
+    design_primers = primer3.bindings.designPrimers
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return design_primers(*args, **kwargs)
+
+    monkeypatch.setattr(primer3.bindings, "designPrimers", counted)
+    return calls
+
+
+def new_design(template, cache):
+    design = Design(cache=cache)
+    design.settings.template(template)
+    design.settings.primer_num_return(1)
+    return design
+
+
+def test_cache_hit_skips_primer3(gfp, count_calls):
+    cache = ResultCache()
+    results = new_design(gfp, cache).run()
+    assert results[0]
+    assert new_design(gfp, cache).run() == results
+    assert len(count_calls) == 1
+    assert cache.info() == (1, 1, 1024, 1)
+
+
+def test_cache_miss_on_different_parameters(gfp, count_calls):
+    cache = ResultCache()
+    new_design(gfp, cache).run()
+    design = new_design(gfp, cache)
+    design.settings.primer_num_return(2)
+    design.run()
+    design = new_design(gfp, cache)
+    design.settings.left_overhang("AAAA")
+    design.run()
+    assert len(count_calls) == 3
+    assert cache.hits == 0
+
+
+def test_cache_returns_copies(gfp):
+    cache = ResultCache()
+    pairs, explain = new_design(gfp, cache).run()
+    pairs[0]["LEFT"]["SEQUENCE"] = "modified"
+    pairs, explain = new_design(gfp, cache).run()
+    assert pairs[0]["LEFT"]["SEQUENCE"] != "modified"
+
+
+def test_cache_lru_eviction(gfp, count_calls):
+    cache = ResultCache(maxsize=1)
+    new_design(gfp, cache).run()
+    new_design(gfp[:400], cache).run()
+    assert len(cache) == 1
+    new_design(gfp, cache).run()
+    assert len(count_calls) == 3
+
+
+def test_cache_sqlite_backend(gfp, tmpdir, count_calls):
+    path = str(tmpdir.join("cache.sqlite"))
+    results = new_design(gfp, ResultCache(path=path)).run()
+
+    cache = ResultCache(path=path)
+    assert new_design(gfp, cache).run() == results
+    assert len(count_calls) == 1
+    assert cache.hits == 1
+
+    cache.clear()
+    new_design(gfp, cache).run()
+    assert len(count_calls) == 2
+
+
+def test_cache_pickles_backend_only(tmpdir):
+    path = str(tmpdir.join("cache.sqlite"))
+    cache = ResultCache(maxsize=3, path=path)
+    cache.set("key", ({}, {}))
+    copied = pickle.loads(pickle.dumps(cache))
+    assert copied.maxsize == 3
+    assert len(copied) == 0
+    assert copied.get("key") == ({}, {})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cache_used_by_run_many(gfp, tmpdir, workers, count_calls):
+    templates = [gfp[i : i + 400] for i in range(0, 200, 100)]
+    path = str(tmpdir.join("cache.sqlite"))
+    design = new_design("", ResultCache(path=path))
+    results = design.run_many(templates, workers=workers)
+
+    design = new_design("", ResultCache(path=path))
+    assert design.run_many(templates, workers=1) == results
+    assert design.cache.hits == len(templates)
@@ -1,6 +1,10 @@
 import random
 
+import primer3
+import pytest
+
 from primer3plus.design import Design
+from primer3plus.design.results import parse_explain
 from primer3plus.utils import anneal
 from primer3plus.utils import reverse_complement
 
@@ -19,3 +23,136 @@ def test_run_and_optimize_basic(gfp, iter_random_primer):
     pairs, explain = design.run_and_optimize(15)
     print(explain)
     assert pairs
+
+
+def test_parse_explain():
+    assert parse_explain("considered 10, low tm 2, high hairpin stability 3, ok 5") == {
+        "considered": 10,
+        "low tm": 2,
+        "high hairpin stability": 3,
+        "ok": 5,
+    }
+
+
+def test_blocking_reasons():
+    explain = {
+        "PRIMER_LEFT_EXPLAIN": "considered 1, high tm 1, ok 0",
+        "PRIMER_RIGHT_EXPLAIN": "considered 4, low tm 3, ok 1",
+        "PRIMER_PAIR_EXPLAIN": "considered 0, ok 0",
+    }
+    assert Design._blocking_reasons(explain) == {"high tm": 1}
+
+
+def test_explain_update_dict_only_steps_blocking_parameters():
+    design = Design()
+    explain = {"PRIMER_LEFT_EXPLAIN": "considered 1, high tm 1, ok 0"}
+    gradient = dict(
+        PRIMER_MAX_TM=(1.0, 60.0, 80.0), PRIMER_MAX_HAIRPIN_TH=(1.0, 47.0, 60.0)
+    )
+    update = design._explain_update_dict(design.params, gradient, explain)
+    assert update == {"PRIMER_MAX_TM": design.params["PRIMER_MAX_TM"] + 1}
+
+    # fall back to the full gradient when no blocking parameter can be stepped
+    explain = {"PRIMER_PAIR_EXPLAIN": "considered 6, unacceptable product size 6, ok 0"}
+    update = design._explain_update_dict(design.params, gradient, explain)
+    assert set(update) == set(gradient)
+
+
+def test_run_and_optimize_explain_strategy(gfp, monkeypatch):
+    calls = []
+    design_primers = primer3.bindings.designPrimers
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return design_primers(*args, **kwargs)
+
+    monkeypatch.setattr(primer3.bindings, "designPrimers", counted)
+
+    def new_design():
+        design = Design()
+        design.settings.template(gfp)
+        design.settings.left_sequence(gfp[:25])
+        design.settings.right_sequence(reverse_complement(gfp[-25:]))
+        design.settings.task("check_primers")
+        return design
+
+    design = new_design()
+    pairs, explain = design.run_and_optimize(15, strategy="explain")
+    assert pairs
+    n_explain = len(calls)
+
+    del calls[:]
+    pairs, explain = new_design().run_and_optimize(15)
+    assert pairs
+    assert n_explain <= len(calls)
+
+
+def test_run_and_optimize_invalid_strategy(gfp):
+    design = Design()
+    design.settings.template(gfp)
+    with pytest.raises(ValueError):
+        design.run_and_optimize(15, strategy="not a strategy")
+
+
+def new_check_primers_design(gfp):
+    design = Design()
+    design.settings.template(gfp)
+    design.settings.left_sequence(gfp[:25])
+    design.settings.right_sequence(reverse_complement(gfp[-25:]))
+    design.settings.task("check_primers")
+    return design
+
+
+def test_run_and_optimize_reports_iterations(gfp):
+    design = new_check_primers_design(gfp)
+    pairs, explain = design.run_and_optimize(15)
+    assert pairs
+    assert explain[Design.NUM_ITERATIONS] > 0
+    changed = explain[Design.CHANGED_PARAMETERS]
+    assert changed["PRIMER_MAX_TM"] > design.PRIMER_MAX_TM.value
+
+
+def test_run_and_optimize_bisect(gfp):
+    pairs, linear_explain = new_check_primers_design(gfp).run_and_optimize(30)
+    assert pairs
+    pairs, explain = new_check_primers_design(gfp).run_and_optimize(
+        30, strategy="bisect"
+    )
+    assert pairs
+    assert explain[Design.NUM_ITERATIONS] < linear_explain[Design.NUM_ITERATIONS]
+    assert (
+        explain[Design.CHANGED_PARAMETERS] == linear_explain[Design.CHANGED_PARAMETERS]
+    )
+
+
+def test_run_and_optimize_bisect_end_of_gradient(gfp):
+    design = new_check_primers_design(gfp)
+    gradient = dict(PRIMER_MAX_TM=(1.0, 60.0, 64.0))
+    pairs, explain = design.run_and_optimize(30, gradient=gradient, strategy="bisect")
+    assert not pairs
+    assert explain[Design.NUM_ITERATIONS] == 1
+    assert explain[Design.CHANGED_PARAMETERS] == {"PRIMER_MAX_TM": 64.0}
+
+
+@pytest.mark.parametrize("workers", [2, 4])
+def test_run_and_optimize_speculative(gfp, workers):
+    pairs, expected_explain = new_check_primers_design(gfp).run_and_optimize(15)
+    design = new_check_primers_design(gfp)
+    results = design.run_and_optimize(15, workers=workers)
+    assert results == (pairs, expected_explain)
+    assert design.PRIMER_MAX_TM.value == 63.0
+
+
+def test_run_and_optimize_speculative_end_of_gradient(gfp):
+    design = new_check_primers_design(gfp)
+    gradient = dict(PRIMER_MAX_TM=(1.0, 60.0, 64.0))
+    pairs, explain = design.run_and_optimize(30, gradient=gradient, workers=2)
+    assert not pairs
+    assert explain[Design.NUM_ITERATIONS] == 1
+    assert explain[Design.CHANGED_PARAMETERS] == {"PRIMER_MAX_TM": 64.0}
+
+
+def test_run_and_optimize_speculative_requires_linear(gfp):
+    design = new_check_primers_design(gfp)
+    with pytest.raises(ValueError):
+        design.run_and_optimize(15, strategy="explain", workers=2)
@@ -0,0 +1,109 @@
+import pytest
+
+import primer3plus.design as design_module
+from primer3plus import Design
+
+
+@pytest.fixture(scope="module")
+def templates(gfp):
+    return [gfp[i : i + 400] for i in range(0, 300, 100)]
+
+
+def new_design():
+    design = Design()
+    design.settings.as_generic_task()
+    design.settings.primer_num_return(1)
+    return design
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_many_matches_run(templates, workers):
+    design = new_design()
+    results = design.run_many(templates, workers=workers)
+    assert len(results) == len(templates)
+
+    for template, (pairs, explain) in zip(templates, results):
+        assert pairs
+        expected_design = new_design()
+        expected_design.settings.template(template)
+        expected_pairs, expected_explain = expected_design.run()
+        assert pairs == expected_pairs
+        assert explain == expected_explain
+
+
+def test_run_many_does_not_modify_design(templates):
+    design = new_design()
+    design.run_many(templates, workers=2)
+    assert design.SEQUENCE_TEMPLATE.value == ""
+
+
+def test_run_many_with_parameter_dicts(gfp):
+    design = new_design()
+    jobs = [
+        {"SEQUENCE_TEMPLATE": gfp, "SEQUENCE_ID": "a"},
+        {"SEQUENCE_TEMPLATE": gfp, "PRIMER_NUM_RETURN": 3},
+    ]
+    results = design.run_many(jobs, workers=2)
+    assert len(results[0][0]) == 1
+    assert len(results[1][0]) == 3
+
+
+def test_run_many_returns_errors_as_values(templates):
+    design = new_design()
+    jobs = [templates[0], {"NOT_A_PARAMETER": 1}, templates[1]]
+    results = design.run_many(jobs, workers=2)
+    assert results[0][0]
+    assert results[1] == ({}, {"PRIMER_ERROR": results[1][1]["PRIMER_ERROR"]})
+    assert "NOT_A_PARAMETER" in results[1][1]["PRIMER_ERROR"]
+    assert results[2][0]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_iter(templates, workers):
+    design = new_design()
+    jobs = [
+        {"SEQUENCE_ID": str(i), "SEQUENCE_TEMPLATE": t} for i, t in enumerate(templates)
+    ]
+    results = list(design.run_iter(jobs, workers=workers))
+    assert sorted(job["SEQUENCE_ID"] for job, _, _ in results) == ["0", "1", "2"]
+
+    expected = dict(
+        zip([job["SEQUENCE_ID"] for job in jobs], design.run_many(jobs, workers=1))
+    )
+    for job, pairs, explain in results:
+        assert (pairs, explain) == expected[job["SEQUENCE_ID"]]
+
+
+def test_run_iter_bounds_jobs_in_flight(templates):
+    consumed = []
+
+    def jobs():
+        for i in range(12):
+            consumed.append(i)
+            yield templates[i % len(templates)]
+
+    design = new_design()
+    n_yielded = 0
+    for _ in design.run_iter(jobs(), workers=2, max_in_flight=3):
+        n_yielded += 1
+        assert len(consumed) - n_yielded <= 3
+    assert n_yielded == 12
+
+
+def test_run_iter_returns_errors_as_values(templates):
+    design = new_design()
+    results = list(design.run_iter([templates[0], {"NOT_A_PARAMETER": 1}], workers=2))
+    errors = [
+        explain["PRIMER_ERROR"]
+        for _, _, explain in results
+        if "PRIMER_ERROR" in explain
+    ]
+    assert len(errors) == 1
+
+
+def test_run_many_while_primer3_lock_is_held(templates):
+    # worker processes forked while another thread is designing must not
+    # inherit a held lock
+    with design_module._primer3_lock:
+        results = new_design().run_many(templates[:2], workers=2)
+    assert all(pairs for pairs, _ in results)
@@ -0,0 +1,51 @@
+import gzip
+import io
+import json
+
+from primer3plus.io import read_fasta
+from primer3plus.io import read_jsonl
+
+
+FASTA = """>seq1 first sequence
+AGGTTGCGTGTG
+TATGGTCGTG
+
+>seq2
+TAGTGTGT
+>
+ACGT
+"""
+
+
+def test_read_fasta_handle():
+    records = list(read_fasta(io.StringIO(FASTA)))
+    assert records == [
+        {"SEQUENCE_ID": "seq1", "SEQUENCE_TEMPLATE": "AGGTTGCGTGTGTATGGTCGTG"},
+        {"SEQUENCE_ID": "seq2", "SEQUENCE_TEMPLATE": "TAGTGTGT"},
+        {"SEQUENCE_ID": "", "SEQUENCE_TEMPLATE": "ACGT"},
+    ]
+
+
+def test_read_fasta_is_lazy():
+    records = read_fasta(io.StringIO(FASTA))
+    assert next(records)["SEQUENCE_ID"] == "seq1"
+
+
+def test_read_fasta_gzip(tmpdir):
+    path = str(tmpdir.join("seqs.fasta.gz"))
+    with gzip.open(path, "wt") as f:
+        f.write(FASTA)
+    assert len(list(read_fasta(path))) == 3
+
+
+def test_read_jsonl(tmpdir):
+    rows = [
+        {"SEQUENCE_ID": "seq1", "SEQUENCE_TEMPLATE": "AGGT"},
+        {"SEQUENCE_ID": "seq2", "PRIMER_NUM_RETURN": 2},
+    ]
+    path = str(tmpdir.join("jobs.jsonl"))
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+        f.write("\n")
+    assert list(read_jsonl(path)) == rows